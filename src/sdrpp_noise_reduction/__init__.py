@@ -2,7 +2,25 @@
 
 __version__ = "0.1.0"
 
-from .config import NoiseReductionConfig
+import scipy.fft
+
+from .config import ConfigSnapshot, NoiseReductionConfig
 from .cli import main
 
-__all__ = ['NoiseReductionConfig', 'main']
+__all__ = ['ConfigSnapshot', 'NoiseReductionConfig', 'main']
+
+
+def _enable_fftw_backend():
+    # Route scipy.fft through FFTW with plan caching when pyFFTW is installed.
+    try:
+        import pyfftw
+        import pyfftw.interfaces.scipy_fft as fftw_backend
+    except ImportError:
+        return
+
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    scipy.fft.set_global_backend(fftw_backend)
+
+
+_enable_fftw_backend()
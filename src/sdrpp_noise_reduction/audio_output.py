@@ -1,36 +1,88 @@
-import queue
+import logging
+import time
 import numpy as np
 import sounddevice as sd
+from numba import njit
 
-audio_buffer = np.array([], dtype=np.float32)
+from .utils import NumpySPSCRing, RING_READ, RING_WRITE
 
+logger = logging.getLogger(__name__)
 
-def audio_callback(outdata, frames, time_info, status, processed_audio_queue: queue.Queue):
-    global audio_buffer
 
-    if status:
-        print(f"Audio status: {status}")
-
-    while len(audio_buffer) < frames:
-        try:
-            audio_chunk = processed_audio_queue.get_nowait()
-            audio_buffer = np.concatenate([audio_buffer, audio_chunk])
-        except queue.Empty:
-            needed = frames - len(audio_buffer)
-            audio_buffer = np.concatenate([audio_buffer, np.zeros(needed, dtype=np.float32)])
+class CallbackStatus:
+    # Latest non-empty status flags from the audio callback, reported by monitor_callback_status.
+    def __init__(self):
+        self.pending = None
+
+
+@njit(nogil=True, cache=True)
+def _read_frames(ring_buf, cursors, read_offset, out):
+    # Copy frames from the ring straight into out, zero-filling on underrun.
+    # read_offset[0] tracks the position inside a partially played chunk.
+    slots, chunk_len = ring_buf.shape
+    frames = out.shape[0]
+    n = 0
+
+    while n < frames:
+        r = cursors[RING_READ]
+        if r == cursors[RING_WRITE]:
             break
 
-    if len(audio_buffer) >= frames:
-        outdata[:, 0] = audio_buffer[:frames]
-        audio_buffer = audio_buffer[frames:]
-    else:
-        outdata[:, 0] = np.pad(audio_buffer, (0, frames - len(audio_buffer)), mode='constant')
-        audio_buffer = np.array([], dtype=np.float32)
+        slot = r % slots
+        offset = read_offset[0]
+        take = min(chunk_len - offset, frames - n)
+        for i in range(take):
+            out[n + i] = ring_buf[slot, offset + i]
+        n += take
+
+        if offset + take == chunk_len:
+            read_offset[0] = 0
+            cursors[RING_READ] = r + 1
+        else:
+            read_offset[0] = offset + take
+
+    for i in range(n, frames):
+        out[i] = 0.0
+
+    return n
+
+
+def audio_callback(outdata, frames, time_info, status, processed_audio_ring: NumpySPSCRing, read_offset: np.ndarray,
+                   callback_status: CallbackStatus):
+    # Runs on the realtime thread: only record the status, never log from here.
+    if status:
+        callback_status.pending = status
+
+    _read_frames(processed_audio_ring.buf, processed_audio_ring.cursors, read_offset, outdata[:, 0])
+
+
+def monitor_callback_status(callback_status: CallbackStatus, running_flag, interval: float = 0.5) -> None:
+    # Log audio callback status flags from a normal thread.
+    while running_flag():
+        status = callback_status.pending
+        if status:
+            callback_status.pending = None
+            logger.warning("Audio status: %s", status)
+
+        time.sleep(interval)
 
 
-def create_audio_stream(processed_audio_queue: queue.Queue, sample_rate: int, channels: int, blocksize: int, latency: str):
+def create_audio_stream(processed_audio_ring: NumpySPSCRing, callback_status: CallbackStatus, sample_rate: int, channels: int,
+                        blocksize: int, latency: str):
+    read_offset = np.zeros(1, dtype=np.int64)
+
+    # Compile the kernel here rather than on the first realtime callback. Scratch ring state
+    # with the same types keeps audio already queued by the processor untouched, and the
+    # [:, 0] view matches the non-contiguous layout of outdata[:, 0].
+    _read_frames(
+        np.zeros_like(processed_audio_ring.buf),
+        np.zeros_like(processed_audio_ring.cursors),
+        np.zeros(1, dtype=np.int64),
+        np.zeros((blocksize, channels), dtype=np.float32)[:, 0]
+    )
+
     callback = lambda outdata, frames, time_info, status: audio_callback(
-        outdata, frames, time_info, status, processed_audio_queue
+        outdata, frames, time_info, status, processed_audio_ring, read_offset, callback_status
     )
 
     stream = sd.OutputStream(
@@ -41,5 +93,5 @@ def create_audio_stream(processed_audio_queue: queue.Queue, sample_rate: int, ch
         latency=latency,
         callback=callback
     )
-    
+
     return stream
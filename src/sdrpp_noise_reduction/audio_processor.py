@@ -1,161 +1,296 @@
-import queue
+import logging
+import time
 import numpy as np
 import noisereduce as nr
+from numba import njit
+from scipy import fft as scipy_fft
 from scipy import signal as scipy_signal
 
-from .config import NoiseReductionConfig
-from .constants import SAMPLE_RATE
-from .utils import put_with_drop_on_full, format_config_status
+from .config import ConfigSnapshot, NoiseReductionConfig
+from .constants import SAMPLE_RATE, AUDIO_BUFFER_SIZE, STFT_WINDOW_SIZE, STFT_HOP_SIZE, RING_POLL_INTERVAL
+from .utils import NumpySPSCRing, format_config_status
+
+logger = logging.getLogger(__name__)
 
 bandpass_filter_coeffs = None
 bandpass_filter_cache_key = None
 bandpass_filter_state = None
+bandpass_filter_zi = None
 
 noise_profile_initialized = False
 noise_profile = None
+noise_thresh_power = None
+noise_thresh_power_cache_key = None
+
+stft_window = scipy_signal.get_window('hann', STFT_WINDOW_SIZE)
+stft_fft_len = scipy_fft.next_fast_len(STFT_WINDOW_SIZE, real=True)
+stft_norm_cache = {}
+
+
+@njit(cache=True, fastmath=True)
+def _sosfilt_df2(sos, zi, x, y):
+    # Transposed Direct-Form-II biquad cascade; updates zi in place and writes into y.
+    n_sections = sos.shape[0]
+    for n in range(x.shape[0]):
+        v = x[n]
+        for s in range(n_sections):
+            b0 = sos[s, 0]
+            b1 = sos[s, 1]
+            b2 = sos[s, 2]
+            a1 = sos[s, 4]
+            a2 = sos[s, 5]
+            out = b0 * v + zi[s, 0]
+            zi[s, 0] = b1 * v - a1 * out + zi[s, 1]
+            zi[s, 1] = b2 * v - a2 * out
+            v = out
+        y[n] = v
 
 
 def get_bandpass_filter_coeffs(low_freq: float, high_freq: float, sample_rate: int):
-    global bandpass_filter_coeffs, bandpass_filter_cache_key, bandpass_filter_state
+    global bandpass_filter_coeffs, bandpass_filter_cache_key, bandpass_filter_state, bandpass_filter_zi
+
+    nyquist = sample_rate / 2
+    low = max(0.01, min(low_freq / nyquist, 0.99))
+    high = max(0.01, min(high_freq / nyquist, 0.99))
 
-    cache_key = (low_freq, high_freq, sample_rate)
+    # Key on the clipped, normalized edges so settings that clip to the same band
+    # keep the existing coefficients and filter state.
+    cache_key = (low, high)
     if bandpass_filter_cache_key is None or bandpass_filter_cache_key != cache_key:
         bandpass_filter_coeffs = None
         bandpass_filter_state = None
         bandpass_filter_cache_key = cache_key
 
-    if bandpass_filter_coeffs is None:
-        nyquist = sample_rate / 2
-        low = low_freq / nyquist
-        high = high_freq / nyquist
-
-        low = max(0.01, min(low, 0.99))
-        high = max(0.01, min(high, 0.99))
+    if low >= high:
+        return None, None
 
-        if low >= high:
-            return None, None
-
-        b, a = scipy_signal.butter(4, [low, high], btype='band')
-        bandpass_filter_coeffs = (b, a)
-        bandpass_filter_state = scipy_signal.lfilter_zi(b, a)
+    if bandpass_filter_coeffs is None:
+        sos = scipy_signal.butter(4, [low, high], btype='band', output='sos')
+        # Normalize each section by a0 once so the filter kernel never divides.
+        sos = np.ascontiguousarray(sos / sos[:, 3:4], dtype=np.float64)
+        bandpass_filter_coeffs = sos
+        # Unit-step initial state; scaled by the first sample whenever the state is (re)seeded.
+        bandpass_filter_zi = np.ascontiguousarray(scipy_signal.sosfilt_zi(sos), dtype=np.float64)
 
     return bandpass_filter_coeffs, bandpass_filter_state
 
 
-def apply_bandpass_filter(audio: np.ndarray, low_freq: float, high_freq: float, sample_rate: int) -> np.ndarray:
+def apply_bandpass_filter(audio: np.ndarray, low_freq: float, high_freq: float, sample_rate: int, out: np.ndarray = None) -> np.ndarray:
     global bandpass_filter_state
 
-    coeffs, _ = get_bandpass_filter_coeffs(low_freq, high_freq, sample_rate)
+    sos, zi = get_bandpass_filter_coeffs(low_freq, high_freq, sample_rate)
 
-    if coeffs is None:
+    if sos is None:
         return audio
 
-    b, a = coeffs
+    if zi is None:
+        zi = bandpass_filter_state = bandpass_filter_zi * audio[0]
 
-    filtered_audio, bandpass_filter_state = scipy_signal.lfilter(
-        b, a, audio, zi=bandpass_filter_state
-    )
+    if out is None:
+        out = np.empty(len(audio), dtype=np.float32)
 
-    return filtered_audio
+    _sosfilt_df2(sos, zi, audio, out)
 
+    return out
 
-def apply_spectral_gating(audio: np.ndarray, threshold_db: float = -40.0) -> np.ndarray:
-    rms = np.sqrt(np.mean(audio ** 2))
-    rms_db = 20 * np.log10(rms + 1e-10)
 
-    if rms_db < threshold_db:
-        return audio * 0.1
-    
-    return audio
+@njit(cache=True, fastmath=True)
+def _mean_square(x):
+    # Mean of x**2 in one pass without allocating the squared array.
+    total = 0.0
+    for i in range(x.shape[0]):
+        total += x[i] * x[i]
+    return total / max(x.shape[0], 1)
 
 
-def initialize_noise_profile(audio_data: np.ndarray, noise_samples: list, samples_collected: int, samples_needed: int) -> tuple:
-    # Collect samples and initialize noise profile when enough samples collected.
-    noise_samples.append(audio_data)
+@njit(cache=True, fastmath=True)
+def _finalize(audio_in, gain, gate_scale, out):
+    # Apply gate and gain, then clip to [-1, 1], in a single pass into out.
+    # out may alias audio_in for in-place use; min/max keeps the clamp branchless.
+    scale = gain * gate_scale
+    for i in range(audio_in.shape[0]):
+        out[i] = min(max(audio_in[i] * scale, -1.0), 1.0)
+
+
+def spectral_gate_scale(audio: np.ndarray, threshold_linear: float = 0.01) -> float:
+    # Attenuation factor for the chunk: 0.1 when its RMS level is below the threshold.
+    # Compares mean square against the squared threshold, so no sqrt or log10 per chunk.
+    if _mean_square(audio) < threshold_linear * threshold_linear:
+        return 0.1
+
+    return 1.0
+
+
+def initialize_noise_profile(audio_data: np.ndarray, noise_buf: np.ndarray, samples_collected: int) -> tuple:
+    # Collect samples into the rows of noise_buf and initialize noise profile once every row is filled.
+    noise_buf[samples_collected] = audio_data
     samples_collected += 1
 
-    if samples_collected >= samples_needed:
-        combined_noise = np.concatenate(noise_samples)
-        print("Noise profile initialized")
-        return combined_noise, True, samples_collected
-    
+    if samples_collected >= noise_buf.shape[0]:
+        logger.info("Noise profile initialized")
+        return noise_buf.reshape(-1), True, samples_collected
+
     return None, False, samples_collected
 
 
-def apply_noise_reduction(filtered_audio: np.ndarray, cfg: dict) -> np.ndarray:
+@njit(cache=True)
+def _overlap_add(frames, hop, out):
+    # Sum frames into out, each frame starting hop samples after the previous one.
+    win = frames.shape[1]
+    for f in range(frames.shape[0]):
+        start = f * hop
+        for i in range(win):
+            out[start + i] += frames[f, i]
+
+
+def _stft_frames(audio: np.ndarray) -> np.ndarray:
+    # Windowed frames of the reflect-padded signal, shape (n_frames, STFT_WINDOW_SIZE).
+    padded = np.pad(audio, STFT_WINDOW_SIZE // 2, mode='reflect')
+    frames = np.lib.stride_tricks.sliding_window_view(padded, STFT_WINDOW_SIZE)[::STFT_HOP_SIZE]
+    return frames * stft_window
+
+
+def _stft_power(audio: np.ndarray) -> np.ndarray:
+    spectrum = scipy_fft.rfft(_stft_frames(audio), n=stft_fft_len, axis=-1)
+    return spectrum.real ** 2 + spectrum.imag ** 2
+
+
+def get_noise_thresh_power(n_std_thresh: float) -> np.ndarray:
+    # Per-bin gating threshold as a power, mean + n_std_thresh * std of the noise profile in dB,
+    # as in noisereduce's stationary mode. For white noise this sits roughly 11 dB above the
+    # mean noise power at the default n_std_thresh.
+    global noise_thresh_power, noise_thresh_power_cache_key
+
+    if noise_thresh_power is None or noise_thresh_power_cache_key != n_std_thresh:
+        noise_db = 10 * np.log10(_stft_power(noise_profile) + 1e-20)
+        thresh_db = np.mean(noise_db, axis=0) + n_std_thresh * np.std(noise_db, axis=0)
+        noise_thresh_power = 10 ** (thresh_db / 10)
+        noise_thresh_power_cache_key = n_std_thresh
+
+    return noise_thresh_power
+
+
+def _stationary_denoise(audio: np.ndarray, noise_thresh_power: np.ndarray, prop: float) -> np.ndarray:
+    # Spectral subtraction with a real-input STFT. The noise-profile gating threshold is
+    # subtracted instead of the mean noise power, deliberately over-subtracting so bins at
+    # noise level are driven to zero rather than leaving musical-noise residue.
+    spectrum = scipy_fft.rfft(_stft_frames(audio), n=stft_fft_len, axis=-1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+
+    # Subtraction gain per bin, blended toward unity by prop so prop=0 leaves the signal untouched.
+    gain = np.sqrt(np.maximum(1.0 - noise_thresh_power / (power + 1e-20), 0.0))
+    spectrum *= 1.0 - prop * (1.0 - gain)
+
+    frames = scipy_fft.irfft(spectrum, n=stft_fft_len, axis=-1)[:, :STFT_WINDOW_SIZE] * stft_window
+
+    padded_len = len(audio) + 2 * (STFT_WINDOW_SIZE // 2)
+    norm = stft_norm_cache.get(padded_len)
+    if norm is None:
+        norm = np.zeros(padded_len)
+        _overlap_add(np.broadcast_to(stft_window ** 2, frames.shape), STFT_HOP_SIZE, norm)
+        norm = np.maximum(norm, 1e-10)
+        stft_norm_cache[padded_len] = norm
+
+    out = np.zeros(padded_len)
+    _overlap_add(frames, STFT_HOP_SIZE, out)
+    out /= norm
+
+    start = STFT_WINDOW_SIZE // 2
+    return out[start:start + len(audio)]
+
+
+def apply_noise_reduction(filtered_audio: np.ndarray, cfg: ConfigSnapshot) -> np.ndarray:
     # Apply noise reduction using stationary or non-stationary mode.
     global noise_profile_initialized, noise_profile
 
-    if cfg['use_stationary_mode'] and noise_profile_initialized and len(noise_profile) >= len(filtered_audio):
-        return nr.reduce_noise(
-            y=filtered_audio,
-            y_noise=noise_profile[:len(filtered_audio)],
-            sr=SAMPLE_RATE,
-            stationary=True,
-            prop_decrease=cfg['prop_decrease'],
-            n_std_thresh_stationary=cfg['n_std_thresh_stationary']
+    if cfg.use_stationary_mode and noise_profile_initialized and len(noise_profile) >= STFT_WINDOW_SIZE:
+        return _stationary_denoise(
+            filtered_audio,
+            get_noise_thresh_power(cfg.n_std_thresh_stationary),
+            cfg.prop_decrease
         )
     else:
         return nr.reduce_noise(
             y=filtered_audio,
             sr=SAMPLE_RATE,
             stationary=False,
-            prop_decrease=cfg['prop_decrease']
+            prop_decrease=cfg.prop_decrease
         )
 
 
-def apply_audio_effects(audio: np.ndarray, cfg: dict) -> np.ndarray:
-    # Apply spectral gating and gain adjustments.
-    if cfg['use_spectral_gating']:
-        audio = apply_spectral_gating(audio, threshold_db=cfg['spectral_gate_threshold_db'])
-
-    if cfg['voice_gain_db'] != 0.0:
-        gain_linear = 10.0 ** (cfg['voice_gain_db'] / 20.0)
-        audio = audio * gain_linear
-
-    return audio
-
-
-def finalize_audio(audio: np.ndarray) -> np.ndarray:
-    # Convert to float32 and clip to valid range.
-    if audio.dtype != np.float32:
-        audio = audio.astype(np.float32)
+def finalize_audio(audio: np.ndarray, gain: float = 1.0, gate_scale: float = 1.0, out: np.ndarray = None) -> np.ndarray:
+    # Apply gain and gating, convert to float32 and clip to valid range.
+    if out is None:
+        out = np.empty(len(audio), dtype=np.float32)
 
-    return np.clip(audio, -1.0, 1.0)
+    _finalize(audio, gain, gate_scale, out)
+    return out
 
 
-def process_audio_chunk(audio_data: np.ndarray, cfg: dict, noise_samples: list, samples_collected: int, samples_needed: int) -> tuple:
+def process_audio_chunk(audio_data: np.ndarray, cfg: ConfigSnapshot, noise_buf: np.ndarray, samples_collected: int,
+                        scratch: np.ndarray = None, out: np.ndarray = None) -> tuple:
     # Process a single audio chunk through the noise reduction pipeline.
+    # scratch and out, when given, are reused buffers at least as long as the chunk.
     global noise_profile_initialized, noise_profile
 
-    if not cfg['noise_reduction_enabled']:
-        return finalize_audio(audio_data), samples_collected
+    n = len(audio_data)
+    if scratch is not None:
+        scratch = scratch[:n]
+    if out is not None:
+        out = out[:n]
+
+    if not cfg.noise_reduction_enabled:
+        return finalize_audio(audio_data, out=out), samples_collected
 
     if not noise_profile_initialized:
         new_profile, initialized, samples_collected = initialize_noise_profile(
-            audio_data, noise_samples, samples_collected, samples_needed
+            audio_data, noise_buf, samples_collected
         )
         if initialized:
             noise_profile = new_profile
             noise_profile_initialized = True
 
-    if cfg['use_bandpass']:
+    if cfg.use_bandpass:
         filtered_audio = apply_bandpass_filter(
             audio_data,
-            cfg['voice_low_freq'],
-            cfg['voice_high_freq'],
-            SAMPLE_RATE
+            cfg.voice_low_freq,
+            cfg.voice_high_freq,
+            SAMPLE_RATE,
+            out=scratch
         )
     else:
         filtered_audio = audio_data
 
     processed_audio = apply_noise_reduction(filtered_audio, cfg)
-    processed_audio = apply_audio_effects(processed_audio, cfg)
 
-    return finalize_audio(processed_audio), samples_collected
+    if cfg.use_spectral_gating:
+        gate_scale = spectral_gate_scale(processed_audio, threshold_linear=cfg.spectral_gate_threshold_linear)
+    else:
+        gate_scale = 1.0
+
+    return finalize_audio(processed_audio, cfg.voice_gain_linear, gate_scale, out=out), samples_collected
+
+
+def warm_up_kernels(cfg: ConfigSnapshot, scratch: np.ndarray, out: np.ndarray) -> None:
+    # Run every Numba kernel once on silence so compilation happens before the first real
+    # chunk instead of while the raw ring overflows. Noise profile state is left untouched.
+    global bandpass_filter_state
+
+    silence = np.zeros(len(scratch), dtype=np.float32)
+
+    apply_bandpass_filter(silence, cfg.voice_low_freq, cfg.voice_high_freq, SAMPLE_RATE, out=scratch)
+    # Let the first real chunk seed the filter state.
+    bandpass_filter_state = None
+
+    denoised = _stationary_denoise(silence, np.ones(stft_fft_len // 2 + 1), cfg.prop_decrease)
 
+    for audio in (silence, denoised):
+        spectral_gate_scale(audio, cfg.spectral_gate_threshold_linear)
+        finalize_audio(audio, cfg.voice_gain_linear, 1.0, out=out)
+        finalize_audio(audio, out=out)
 
-def process_audio(raw_audio_queue: queue.Queue, config: NoiseReductionConfig, processed_audio_queue: queue.Queue, running_flag) -> None:
+
+def process_audio(raw_audio_ring: NumpySPSCRing, config: NoiseReductionConfig, processed_audio_ring: NumpySPSCRing, running_flag) -> None:
     # Main audio processing loop that receives raw audio and outputs processed audio.
     global noise_profile_initialized, noise_profile
 
@@ -166,24 +301,31 @@ def process_audio(raw_audio_queue: queue.Queue, config: NoiseReductionConfig, pr
     for line in status_lines[1:-1]:  # Skip header and trailing empty line
         print(line)
 
-    noise_samples = []
     samples_collected = 0
-    samples_needed = config.noise_profile_samples
+    noise_buf = np.empty((config.noise_profile_samples, AUDIO_BUFFER_SIZE), dtype=np.float32)
+
+    # The rings copy chunks in and out, so one set of working buffers is reused for every chunk.
+    audio_data = np.empty(AUDIO_BUFFER_SIZE, dtype=np.float32)
+    scratch = np.empty_like(audio_data)
+    out = np.empty_like(audio_data)
+
+    warm_up_kernels(cfg, scratch, out)
 
     while running_flag():
         try:
-            audio_data = raw_audio_queue.get(timeout=1.0)
+            if not raw_audio_ring.get_into(audio_data):
+                time.sleep(RING_POLL_INTERVAL)
+                continue
 
             cfg = config.get_all()
             
             processed_audio, samples_collected = process_audio_chunk(
-                audio_data, cfg, noise_samples, samples_collected, samples_needed
+                audio_data, cfg, noise_buf, samples_collected,
+                scratch=scratch, out=out
             )
 
-            put_with_drop_on_full(processed_audio_queue, processed_audio)
+            processed_audio_ring.put(processed_audio)
 
-        except queue.Empty:
-            continue
         except Exception as e:
             if running_flag():
-                print(f"Error processing audio: {e}")
+                logger.warning("Error processing audio: %s", e)
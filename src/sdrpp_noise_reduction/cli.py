@@ -3,18 +3,18 @@ import argparse
 import signal
 import threading
 import time
-import queue
 import sounddevice as sd
 
 from .config import NoiseReductionConfig
 from .constants import (
-    SAMPLE_RATE, CHANNELS, UDP_PORT, BLOCKSIZE, LATENCY,
-    DEFAULT_VOICE_LOW_FREQ, DEFAULT_VOICE_HIGH_FREQ
+    SAMPLE_RATE, CHANNELS, UDP_PORT, BLOCKSIZE, LATENCY, AUDIO_BUFFER_SIZE,
+    RAW_AUDIO_SLOTS, PROCESSED_AUDIO_SLOTS, DEFAULT_VOICE_LOW_FREQ, DEFAULT_VOICE_HIGH_FREQ
 )
 from .udp_receiver import receive_udp_audio
 from .audio_processor import process_audio
-from .audio_output import create_audio_stream
+from .audio_output import CallbackStatus, create_audio_stream, monitor_callback_status
 from .commands import command_input_thread
+from .utils import NumpySPSCRing, start_background_logging
 
 
 class RunningFlag:
@@ -99,7 +99,7 @@ Examples:
         type=float,
         default=-35.0,
         metavar='DB',
-        help='Spectral gating threshold in dB (default: -35.0)'
+        help='Spectral gating threshold in dB (-200 to +200, default: -35.0)'
     )
 
     parser.add_argument(
@@ -161,6 +161,9 @@ Examples:
     if not -20.0 <= args.voice_gain <= 20.0:
         parser.error("--voice-gain must be between -20.0 and +20.0 dB")
 
+    if not -200.0 <= args.spectral_gate <= 200.0:
+        parser.error("--spectral-gate must be between -200.0 and +200.0 dB")
+
     return args
 
 
@@ -169,6 +172,7 @@ def main():
     args = parse_arguments()
 
     running_flag = RunningFlag()
+    log_listener = start_background_logging()
 
     # Create noise reduction configuration
     config = NoiseReductionConfig(
@@ -194,12 +198,12 @@ def main():
     print(f"Channels: {CHANNELS}")
     print("=" * 40)
 
-    raw_audio_queue = queue.Queue(maxsize=10)
-    processed_audio_queue = queue.Queue(maxsize=20)
+    raw_audio_ring = NumpySPSCRing(RAW_AUDIO_SLOTS, AUDIO_BUFFER_SIZE)
+    processed_audio_ring = NumpySPSCRing(PROCESSED_AUDIO_SLOTS, AUDIO_BUFFER_SIZE)
 
     udp_thread = threading.Thread(
         target=receive_udp_audio,
-        args=(args.udp_port, raw_audio_queue, running_flag),
+        args=(args.udp_port, raw_audio_ring, running_flag),
         daemon=True
     )
     udp_thread.start()
@@ -207,7 +211,7 @@ def main():
     # Start audio processing thread
     process_thread = threading.Thread(
         target=process_audio,
-        args=(raw_audio_queue, config, processed_audio_queue, running_flag),
+        args=(raw_audio_ring, config, processed_audio_ring, running_flag),
         daemon=True
     )
     process_thread.start()
@@ -219,6 +223,14 @@ def main():
     )
     cmd_thread.start()
 
+    callback_status = CallbackStatus()
+    status_thread = threading.Thread(
+        target=monitor_callback_status,
+        args=(callback_status, running_flag),
+        daemon=True
+    )
+    status_thread.start()
+
     try:
         device_info = sd.query_devices(kind='output')
         print(f"Output device: {device_info['name']}")
@@ -231,7 +243,8 @@ def main():
 
     try:
         stream = create_audio_stream(
-            processed_audio_queue,
+            processed_audio_ring,
+            callback_status,
             SAMPLE_RATE,
             CHANNELS,
             BLOCKSIZE,
@@ -251,6 +264,7 @@ def main():
         if stream is not None:
             stream.stop()
             stream.close()
+        log_listener.stop()
 
     print("Exiting...")
 
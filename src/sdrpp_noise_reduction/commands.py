@@ -122,10 +122,11 @@ def handle_command(cmd: str, config: NoiseReductionConfig) -> bool:
     elif command in ('/spectral_gate', '/sg'):
         return handle_numeric_command(
             parts,
-            "/spectral_gate <dB>",
-            lambda v: True,
+            "/spectral_gate <dB> (range: -200 to +200)",
+            lambda v: -200.0 <= v <= 200.0,
             lambda v: setattr(config, 'spectral_gate_threshold_db', v),
-            "Spectral gate threshold set to {} dB"
+            "Spectral gate threshold set to {} dB",
+            "Error: Spectral gate threshold must be between -200 and +200 dB"
         )
 
     elif command in ('/stationary_threshold', '/st'):
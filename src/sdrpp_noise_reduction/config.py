@@ -1,8 +1,28 @@
 import threading
+from typing import NamedTuple
+
+import numpy as np
 
 from .constants import DEFAULT_VOICE_LOW_FREQ, DEFAULT_VOICE_HIGH_FREQ
 
 
+class ConfigSnapshot(NamedTuple):
+    # Immutable view of every setting, as returned by NoiseReductionConfig.get_all().
+    prop_decrease: float
+    voice_low_freq: float
+    voice_high_freq: float
+    spectral_gate_threshold_db: float
+    spectral_gate_threshold_linear: float
+    noise_profile_samples: int
+    n_std_thresh_stationary: float
+    use_bandpass: bool
+    use_spectral_gating: bool
+    use_stationary_mode: bool
+    voice_gain_db: float
+    voice_gain_linear: np.float32
+    noise_reduction_enabled: bool
+
+
 class NoiseReductionConfig:
     # Thread-safe configuration for noise reduction parameters.
     def __init__(self, prop_decrease=0.95, voice_low_freq=DEFAULT_VOICE_LOW_FREQ,
@@ -14,14 +34,17 @@ class NoiseReductionConfig:
         self._prop_decrease = prop_decrease
         self._voice_low_freq = voice_low_freq
         self._voice_high_freq = voice_high_freq
-        self._spectral_gate_threshold_db = spectral_gate_threshold_db
+        self._spectral_gate_threshold_db = max(-200.0, min(200.0, spectral_gate_threshold_db))
+        self._spectral_gate_threshold_linear = 10.0 ** (self._spectral_gate_threshold_db / 20.0)
         self._noise_profile_samples = noise_profile_samples
         self._n_std_thresh_stationary = n_std_thresh_stationary
         self._use_bandpass = use_bandpass
         self._use_spectral_gating = use_spectral_gating
         self._use_stationary_mode = use_stationary_mode
         self._voice_gain_db = voice_gain_db
+        self._voice_gain_linear = np.float32(10.0 ** (voice_gain_db / 20.0))
         self._noise_reduction_enabled = noise_reduction_enabled
+        self._update_snapshot()
 
     @property
     def prop_decrease(self):
@@ -32,6 +55,7 @@ class NoiseReductionConfig:
     def prop_decrease(self, value):
         with self._lock:
             self._prop_decrease = max(0.0, min(1.0, value))
+            self._update_snapshot()
 
     @property
     def voice_low_freq(self):
@@ -42,6 +66,7 @@ class NoiseReductionConfig:
     def voice_low_freq(self, value):
         with self._lock:
             self._voice_low_freq = value
+            self._update_snapshot()
 
     @property
     def voice_high_freq(self):
@@ -52,6 +77,7 @@ class NoiseReductionConfig:
     def voice_high_freq(self, value):
         with self._lock:
             self._voice_high_freq = value
+            self._update_snapshot()
 
     @property
     def spectral_gate_threshold_db(self):
@@ -60,8 +86,12 @@ class NoiseReductionConfig:
 
     @spectral_gate_threshold_db.setter
     def spectral_gate_threshold_db(self, value):
+        value = max(-200.0, min(200.0, value))
+        threshold_linear = 10.0 ** (value / 20.0)
         with self._lock:
             self._spectral_gate_threshold_db = value
+            self._spectral_gate_threshold_linear = threshold_linear
+            self._update_snapshot()
 
     @property
     def noise_profile_samples(self):
@@ -72,6 +102,7 @@ class NoiseReductionConfig:
     def noise_profile_samples(self, value):
         with self._lock:
             self._noise_profile_samples = max(1, int(value))
+            self._update_snapshot()
 
     @property
     def n_std_thresh_stationary(self):
@@ -82,6 +113,7 @@ class NoiseReductionConfig:
     def n_std_thresh_stationary(self, value):
         with self._lock:
             self._n_std_thresh_stationary = value
+            self._update_snapshot()
 
     @property
     def use_bandpass(self):
@@ -92,6 +124,7 @@ class NoiseReductionConfig:
     def use_bandpass(self, value):
         with self._lock:
             self._use_bandpass = bool(value)
+            self._update_snapshot()
 
     @property
     def use_spectral_gating(self):
@@ -102,6 +135,7 @@ class NoiseReductionConfig:
     def use_spectral_gating(self, value):
         with self._lock:
             self._use_spectral_gating = bool(value)
+            self._update_snapshot()
 
     @property
     def use_stationary_mode(self):
@@ -112,6 +146,7 @@ class NoiseReductionConfig:
     def use_stationary_mode(self, value):
         with self._lock:
             self._use_stationary_mode = bool(value)
+            self._update_snapshot()
 
     @property
     def voice_gain_db(self):
@@ -122,6 +157,8 @@ class NoiseReductionConfig:
     def voice_gain_db(self, value):
         with self._lock:
             self._voice_gain_db = max(-20.0, min(20.0, value))
+            self._voice_gain_linear = np.float32(10.0 ** (self._voice_gain_db / 20.0))
+            self._update_snapshot()
 
     @property
     def noise_reduction_enabled(self):
@@ -132,19 +169,27 @@ class NoiseReductionConfig:
     def noise_reduction_enabled(self, value):
         with self._lock:
             self._noise_reduction_enabled = bool(value)
-
-    def get_all(self):
-        with self._lock:
-            return {
-                'prop_decrease': self._prop_decrease,
-                'voice_low_freq': self._voice_low_freq,
-                'voice_high_freq': self._voice_high_freq,
-                'spectral_gate_threshold_db': self._spectral_gate_threshold_db,
-                'noise_profile_samples': self._noise_profile_samples,
-                'n_std_thresh_stationary': self._n_std_thresh_stationary,
-                'use_bandpass': self._use_bandpass,
-                'use_spectral_gating': self._use_spectral_gating,
-                'use_stationary_mode': self._use_stationary_mode,
-                'voice_gain_db': self._voice_gain_db,
-                'noise_reduction_enabled': self._noise_reduction_enabled
-            }
+            self._update_snapshot()
+
+    def _update_snapshot(self):
+        # Rebuild the settings snapshot; called with the lock held after every change.
+        # Rebinding the attribute is atomic, so readers never see a half-updated snapshot.
+        self._snapshot = ConfigSnapshot(
+            prop_decrease=self._prop_decrease,
+            voice_low_freq=self._voice_low_freq,
+            voice_high_freq=self._voice_high_freq,
+            spectral_gate_threshold_db=self._spectral_gate_threshold_db,
+            spectral_gate_threshold_linear=self._spectral_gate_threshold_linear,
+            noise_profile_samples=self._noise_profile_samples,
+            n_std_thresh_stationary=self._n_std_thresh_stationary,
+            use_bandpass=self._use_bandpass,
+            use_spectral_gating=self._use_spectral_gating,
+            use_stationary_mode=self._use_stationary_mode,
+            voice_gain_db=self._voice_gain_db,
+            voice_gain_linear=self._voice_gain_linear,
+            noise_reduction_enabled=self._noise_reduction_enabled
+        )
+
+    def get_all(self) -> ConfigSnapshot:
+        # Lock-free: returns the current immutable snapshot.
+        return self._snapshot
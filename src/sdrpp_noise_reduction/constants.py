@@ -2,10 +2,16 @@ SAMPLE_RATE = 48000
 CHANNELS = 1
 SAMPLE_WIDTH = 2
 BUFFER_SIZE = 4096
+UDP_RCVBUF_SIZE = 4 * 1024 * 1024
 AUDIO_BUFFER_SIZE = 1024
+STFT_WINDOW_SIZE = 512
+STFT_HOP_SIZE = 128
 UDP_PORT = 7355
 BLOCKSIZE = 1024
 LATENCY = 'high'
+RAW_AUDIO_SLOTS = 10
+PROCESSED_AUDIO_SLOTS = 20
+RING_POLL_INTERVAL = 0.001
 
 DEFAULT_VOICE_LOW_FREQ = 80
 DEFAULT_VOICE_HIGH_FREQ = 8000
@@ -1,38 +1,56 @@
+import logging
 import socket
-import queue
 import numpy as np
 
-from .constants import BUFFER_SIZE, AUDIO_BUFFER_SIZE, SAMPLE_WIDTH
-from .utils import put_with_drop_on_full
+from .constants import BUFFER_SIZE, UDP_RCVBUF_SIZE, AUDIO_BUFFER_SIZE, SAMPLE_WIDTH
+from .utils import NumpySPSCRing
 
+logger = logging.getLogger(__name__)
 
-def receive_udp_audio(port: int, raw_audio_queue: queue.Queue, running_flag) -> None:
+INT16_TO_FLOAT = np.float32(1.0 / 32768.0)
+
+
+def receive_udp_audio(port: int, raw_audio_ring: NumpySPSCRing, running_flag) -> None:
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # A larger kernel buffer absorbs bursts instead of dropping datagrams.
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RCVBUF_SIZE)
     sock.bind(('', port))
     sock.settimeout(1.0)
 
     print(f"Listening for audio on UDP port {port}...")
 
-    buffer = b''
+    chunk_bytes = AUDIO_BUFFER_SIZE * SAMPLE_WIDTH
+    buffer = bytearray()
+    # Datagrams land in an int16 array so whole-chunk packets need no array construction.
+    recv_samples = np.empty(BUFFER_SIZE // SAMPLE_WIDTH, dtype=np.int16)
+    recv_view = memoryview(recv_samples).cast('B')
+    recv_chunk = recv_samples[:AUDIO_BUFFER_SIZE]
+    audio_data = np.empty(AUDIO_BUFFER_SIZE, dtype=np.float32)
 
     while running_flag():
         try:
-            data, _ = sock.recvfrom(BUFFER_SIZE)
-            buffer += data
+            n = sock.recv_into(recv_view)
+
+            if n == chunk_bytes and not buffer:
+                np.multiply(recv_chunk, INT16_TO_FLOAT, out=audio_data, casting='unsafe')
+                raw_audio_ring.put(audio_data)
+                continue
 
-            while len(buffer) >= AUDIO_BUFFER_SIZE * SAMPLE_WIDTH:
-                chunk = buffer[:AUDIO_BUFFER_SIZE * SAMPLE_WIDTH]
-                buffer = buffer[AUDIO_BUFFER_SIZE * SAMPLE_WIDTH:]
+            buffer.extend(recv_view[:n])
 
-                audio_data = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
+            while len(buffer) >= chunk_bytes:
+                # Cast and scale in a single pass; the ring copies the result into its own slot.
+                with memoryview(buffer) as view:
+                    np.multiply(np.frombuffer(view[:chunk_bytes], dtype=np.int16), INT16_TO_FLOAT, out=audio_data, casting='unsafe')
+                del buffer[:chunk_bytes]
 
-                put_with_drop_on_full(raw_audio_queue, audio_data)
+                raw_audio_ring.put(audio_data)
 
         except socket.timeout:
             continue
         except Exception as e:
             if running_flag():
-                print(f"Error receiving UDP data: {e}")
+                logger.warning("Error receiving UDP data: %s", e)
 
     sock.close()
@@ -1,33 +1,92 @@
+import logging
+import logging.handlers
 import queue
+import sys
+import numpy as np
 
+from .config import ConfigSnapshot
 
-def put_with_drop_on_full(q: queue.Queue, item, timeout: float = 0.1):
-    # Put item in queue, dropping oldest item if queue is full.
-    try:
-        q.put(item, timeout=timeout)
-    except queue.Full:
-        try:
-            q.get_nowait()
-            q.put(item, timeout=timeout)
-        except queue.Empty:
-            pass
+RING_READ = 0
+RING_WRITE = 1
 
 
-def format_config_status(cfg: dict) -> str:
+class NumpySPSCRing:
+    # Lock-free single-producer/single-consumer ring of fixed-length chunks.
+    # Only the producer moves the write cursor and only the consumer moves the read
+    # cursor, so no lock is needed. When full, put() drops the new chunk rather than
+    # overwrite a slot the consumer may still be reading. The cursors live in a numpy
+    # array so compiled consumers can read the ring directly.
+    def __init__(self, slots: int, chunk_len: int, dtype=np.float32):
+        self.buf = np.zeros((slots, chunk_len), dtype=dtype)
+        self.slots = slots
+        self.cursors = np.zeros(2, dtype=np.int64)
+
+    def put(self, chunk: np.ndarray) -> bool:
+        # Copy chunk into the next free slot. Returns False if the ring is full.
+        w = int(self.cursors[RING_WRITE])
+        if w - int(self.cursors[RING_READ]) >= self.slots:
+            return False
+
+        np.copyto(self.buf[w % self.slots], chunk)
+        self.cursors[RING_WRITE] = w + 1
+        return True
+
+    def peek(self):
+        # Return a view of the oldest unread chunk, or None if the ring is empty.
+        r = int(self.cursors[RING_READ])
+        if r == int(self.cursors[RING_WRITE]):
+            return None
+
+        return self.buf[r % self.slots]
+
+    def advance(self):
+        # Release the chunk returned by peek().
+        self.cursors[RING_READ] += 1
+
+    def get_into(self, out: np.ndarray) -> bool:
+        # Copy the oldest unread chunk into out. Returns False if the ring is empty.
+        chunk = self.peek()
+        if chunk is None:
+            return False
+
+        np.copyto(out, chunk)
+        self.advance()
+        return True
+
+
+def start_background_logging() -> logging.handlers.QueueListener:
+    # Route package log records through a queue to a listener thread that does the
+    # stdout I/O, so worker threads never block on the stream lock. Caller stops it.
+    log_queue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    logger = logging.getLogger('sdrpp_noise_reduction')
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def format_config_status(cfg: ConfigSnapshot) -> str:
     # Format configuration status as a string for display.
     lines = ["\nCurrent settings:"]
     
-    if not cfg['noise_reduction_enabled']:
+    if not cfg.noise_reduction_enabled:
         lines.append("  Noise reduction: DISABLED")
     else:
-        lines.append(f"  Noise reduction: {cfg['prop_decrease']*100:.1f}%")
-        lines.append(f"  Voice frequency range: {cfg['voice_low_freq']}-{cfg['voice_high_freq']} Hz")
-        lines.append(f"  Voice gain: {cfg['voice_gain_db']:+.1f} dB")
-        lines.append(f"  Spectral gate threshold: {cfg['spectral_gate_threshold_db']:.1f} dB")
-        lines.append(f"  Stationary threshold: {cfg['n_std_thresh_stationary']:.2f}")
-        lines.append(f"  Bandpass filter: {'enabled' if cfg['use_bandpass'] else 'disabled'}")
-        lines.append(f"  Spectral gating: {'enabled' if cfg['use_spectral_gating'] else 'disabled'}")
-        lines.append(f"  Stationary mode: {'enabled' if cfg['use_stationary_mode'] else 'disabled'}")
+        lines.append(f"  Noise reduction: {cfg.prop_decrease*100:.1f}%")
+        lines.append(f"  Voice frequency range: {cfg.voice_low_freq}-{cfg.voice_high_freq} Hz")
+        lines.append(f"  Voice gain: {cfg.voice_gain_db:+.1f} dB")
+        lines.append(f"  Spectral gate threshold: {cfg.spectral_gate_threshold_db:.1f} dB")
+        lines.append(f"  Stationary threshold: {cfg.n_std_thresh_stationary:.2f}")
+        lines.append(f"  Bandpass filter: {'enabled' if cfg.use_bandpass else 'disabled'}")
+        lines.append(f"  Spectral gating: {'enabled' if cfg.use_spectral_gating else 'disabled'}")
+        lines.append(f"  Stationary mode: {'enabled' if cfg.use_stationary_mode else 'disabled'}")
     
     lines.append("")
     return "\n".join(lines)
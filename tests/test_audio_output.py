@@ -0,0 +1,32 @@
+import numpy as np
+
+from sdrpp_noise_reduction.audio_output import CallbackStatus, audio_callback
+from sdrpp_noise_reduction.utils import NumpySPSCRing, RING_READ
+
+
+def test_callback_plays_partial_chunks_in_order_then_zero_fills():
+    chunk_len = 1024
+    frames = 300
+    ring = NumpySPSCRing(4, chunk_len)
+    samples = np.arange(1, 3 * chunk_len + 1, dtype=np.float32)
+    for i in range(3):
+        ring.put(samples[i * chunk_len:(i + 1) * chunk_len])
+
+    read_offset = np.zeros(1, dtype=np.int64)
+    status = CallbackStatus()
+    played = []
+
+    for _ in range(12):
+        outdata = np.full((frames, 1), np.nan, dtype=np.float32)
+        audio_callback(outdata, frames, None, None, ring, read_offset, status)
+        played.append(outdata[:, 0].copy())
+
+        # The read cursor only advances once a chunk has been fully played.
+        consumed = min(len(played) * frames, len(samples))
+        assert ring.cursors[RING_READ] == consumed // chunk_len
+        assert read_offset[0] == consumed % chunk_len
+
+    output = np.concatenate(played)
+    np.testing.assert_array_equal(output[:len(samples)], samples)
+    assert np.all(output[len(samples):] == 0.0)
+    assert status.pending is None
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from scipy import signal as scipy_signal
+
+from sdrpp_noise_reduction import audio_processor
+from sdrpp_noise_reduction.constants import AUDIO_BUFFER_SIZE, SAMPLE_RATE
+
+
+def rms(x):
+    return np.sqrt(np.mean(np.square(x)))
+
+
+@pytest.fixture
+def fresh_bandpass(monkeypatch):
+    for name in ('bandpass_filter_coeffs', 'bandpass_filter_cache_key', 'bandpass_filter_state', 'bandpass_filter_zi'):
+        monkeypatch.setattr(audio_processor, name, None)
+
+
+def test_bandpass_filter_matches_sosfilt_across_chunks(fresh_bandpass):
+    rng = np.random.default_rng(3)
+    audio = (rng.standard_normal(4 * AUDIO_BUFFER_SIZE) * 0.3 + 0.2).astype(np.float32)
+
+    filtered = np.concatenate([
+        audio_processor.apply_bandpass_filter(audio[i:i + AUDIO_BUFFER_SIZE], 80, 8000, SAMPLE_RATE).copy()
+        for i in range(0, len(audio), AUDIO_BUFFER_SIZE)
+    ])
+
+    sos = audio_processor.bandpass_filter_coeffs
+    expected, _ = scipy_signal.sosfilt(sos, audio, zi=scipy_signal.sosfilt_zi(sos) * audio[0])
+    assert np.max(np.abs(filtered - expected)) < 1e-6
+
+
+@pytest.fixture
+def noise_thresh_power(monkeypatch):
+    # White noise profile at 0.01 RMS and its cached per-bin threshold.
+    rng = np.random.default_rng(0)
+    profile = (rng.standard_normal(5 * AUDIO_BUFFER_SIZE) * 0.01).astype(np.float32)
+    monkeypatch.setattr(audio_processor, 'noise_profile', profile)
+    monkeypatch.setattr(audio_processor, 'noise_thresh_power', None)
+    return profile, audio_processor.get_noise_thresh_power(2.5)
+
+
+def test_stationary_denoise_without_reduction_reconstructs_input(noise_thresh_power):
+    _, thresh_power = noise_thresh_power
+    rng = np.random.default_rng(1)
+    audio = (rng.standard_normal(AUDIO_BUFFER_SIZE) * 0.1).astype(np.float32)
+
+    denoised = audio_processor._stationary_denoise(audio, thresh_power, 0.0)
+
+    assert denoised.shape == audio.shape
+    assert np.max(np.abs(denoised - audio)) < 1e-12
+
+
+def test_stationary_denoise_removes_noise_and_keeps_signal(noise_thresh_power):
+    profile, thresh_power = noise_thresh_power
+    rng = np.random.default_rng(2)
+    noise = (rng.standard_normal(AUDIO_BUFFER_SIZE) * 0.01).astype(np.float32)
+
+    # Noise matching the profile is driven to about zero.
+    assert rms(audio_processor._stationary_denoise(profile[:AUDIO_BUFFER_SIZE], thresh_power, 1.0)) < 0.05 * rms(profile)
+    assert rms(audio_processor._stationary_denoise(noise, thresh_power, 1.0)) < 0.05 * rms(noise)
+
+    # A tone 20 dB above the noise keeps most of its level.
+    t = np.arange(AUDIO_BUFFER_SIZE) / SAMPLE_RATE
+    tone = (0.1 * np.sqrt(2) * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+    noisy = tone + noise
+    assert rms(audio_processor._stationary_denoise(noisy, thresh_power, 1.0)) > 0.9 * rms(noisy)
@@ -0,0 +1,73 @@
+import pytest
+
+from sdrpp_noise_reduction.commands import handle_command
+from sdrpp_noise_reduction.config import NoiseReductionConfig
+
+
+@pytest.mark.parametrize('name, value, expected', [
+    ('prop_decrease', 1.5, 1.0),
+    ('voice_low_freq', 300, 300),
+    ('voice_high_freq', 3400, 3400),
+    ('spectral_gate_threshold_db', -20.0, -20.0),
+    ('noise_profile_samples', 0, 1),
+    ('n_std_thresh_stationary', 1.5, 1.5),
+    ('use_bandpass', 0, False),
+    ('use_spectral_gating', 1, True),
+    ('use_stationary_mode', 0, False),
+    ('voice_gain_db', 30.0, 20.0),
+    ('noise_reduction_enabled', 0, False),
+])
+def test_setter_updates_snapshot(name, value, expected):
+    config = NoiseReductionConfig()
+    before = config.get_all()
+
+    setattr(config, name, value)
+
+    cfg = config.get_all()
+    assert getattr(config, name) == expected
+    assert getattr(cfg, name) == expected
+    assert getattr(before, name) != expected
+
+
+@pytest.mark.parametrize('value, expected_db', [(6.0, 6.0), (30.0, 20.0), (-30.0, -20.0)])
+def test_voice_gain_linear_follows_clamped_db(value, expected_db):
+    config = NoiseReductionConfig()
+
+    config.voice_gain_db = value
+
+    assert config.get_all().voice_gain_linear == pytest.approx(10.0 ** (expected_db / 20.0), rel=1e-6)
+
+
+def test_derived_values_match_constructor_arguments():
+    cfg = NoiseReductionConfig(voice_gain_db=6.0, spectral_gate_threshold_db=-40.0).get_all()
+
+    assert cfg.voice_gain_linear == pytest.approx(10.0 ** (6.0 / 20.0), rel=1e-6)
+    assert cfg.spectral_gate_threshold_linear == pytest.approx(0.01)
+
+
+@pytest.mark.parametrize('value, expected', [(7000.0, 200.0), (-7000.0, -200.0), (-35.0, -35.0)])
+def test_spectral_gate_threshold_is_clamped_and_kept_in_sync(value, expected):
+    config = NoiseReductionConfig()
+
+    config.spectral_gate_threshold_db = value
+
+    cfg = config.get_all()
+    assert config.spectral_gate_threshold_db == expected
+    assert cfg.spectral_gate_threshold_db == expected
+    assert cfg.spectral_gate_threshold_linear == pytest.approx(10.0 ** (expected / 20.0))
+
+
+def test_spectral_gate_threshold_is_clamped_in_constructor():
+    cfg = NoiseReductionConfig(spectral_gate_threshold_db=7000.0).get_all()
+
+    assert cfg.spectral_gate_threshold_db == 200.0
+    assert cfg.spectral_gate_threshold_linear == pytest.approx(10.0 ** 10.0)
+
+
+def test_spectral_gate_command_rejects_out_of_range_value(capsys):
+    config = NoiseReductionConfig()
+
+    assert handle_command('/spectral_gate 7000', config)
+
+    assert "must be between -200 and +200 dB" in capsys.readouterr().out
+    assert config.get_all().spectral_gate_threshold_db == -35.0
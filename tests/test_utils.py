@@ -0,0 +1,47 @@
+import numpy as np
+
+from sdrpp_noise_reduction.utils import NumpySPSCRing, RING_READ, RING_WRITE
+
+
+def chunk(value, chunk_len=4):
+    return np.full(chunk_len, value, dtype=np.float32)
+
+
+def test_put_on_full_ring_drops_new_chunk():
+    ring = NumpySPSCRing(3, 4)
+    for i in range(3):
+        assert ring.put(chunk(i))
+    before = ring.buf.copy()
+
+    assert not ring.put(chunk(99))
+
+    np.testing.assert_array_equal(ring.buf, before)
+    assert ring.cursors[RING_WRITE] == 3
+    assert ring.cursors[RING_READ] == 0
+
+
+def test_chunks_come_out_in_order_across_cursor_wrap():
+    ring = NumpySPSCRing(3, 4)
+    out = np.empty(4, dtype=np.float32)
+    received = []
+
+    for i in range(10):
+        assert ring.put(chunk(i))
+        if i % 2:
+            while ring.get_into(out):
+                received.append(out[0])
+
+    assert received == list(range(10))
+    assert ring.cursors[RING_READ] == ring.cursors[RING_WRITE] == 10
+
+
+def test_get_into_on_empty_ring_returns_false():
+    ring = NumpySPSCRing(3, 4)
+    out = chunk(-1)
+
+    assert not ring.get_into(out)
+    np.testing.assert_array_equal(out, chunk(-1))
+
+    ring.put(chunk(1))
+    assert ring.get_into(out)
+    assert not ring.get_into(out)